@@ -1,12 +1,19 @@
 import os
-import uuid
-import json
+import asyncio
 import datetime as dt
-from typing import Optional, List, Dict, Any, Tuple
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from secrets import token_hex
+from typing import Optional, List, Dict, Any, Set, Tuple
 
 import httpx
+import orjson
 import psycopg
+from psycopg.types.json import Jsonb, set_json_dumps
+from psycopg_pool import ConnectionPool
 from fastapi import FastAPI, Header, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 
 
@@ -25,16 +32,25 @@ class PollResponse(BaseModel):
     errors: List[str] = []
 
 
+# Jsonb() binds are serialized by orjson and sent as jsonb, so Postgres skips the text cast
+set_json_dumps(orjson.dumps)
+
+DISPATCH_CONCURRENCY = 32
+EVENT_TYPE = "contact.created"
+
+
 def utcnow() -> dt.datetime:
     return dt.datetime.now(dt.timezone.utc)
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Dict[str, Any]:
+    # Read once per process; call get_settings.cache_clear() to pick up env changes.
     return {
         "DATABASE_URL": os.getenv("DATABASE_URL", ""),
         "WATCHER_AGENT_KEY": os.getenv("WATCHER_AGENT_KEY", ""),
         "BATCH_SIZE": int(os.getenv("BATCH_SIZE", "50")),
-        "DOWNSTREAM_URLS": [u.strip() for u in (os.getenv("DOWNSTREAM_URLS", "") or "").split(",") if u.strip()],
+        "DOWNSTREAM_URLS": tuple(u.strip() for u in (os.getenv("DOWNSTREAM_URLS", "") or "").split(",") if u.strip()),
         "DOWNSTREAM_AUTH_HEADER": os.getenv("DOWNSTREAM_AUTH_HEADER", "x-agent-key"),
         "DOWNSTREAM_AUTH_VALUE": os.getenv("DOWNSTREAM_AUTH_VALUE", ""),
         "WATCHER_NAME": os.getenv("WATCHER_NAME", "watcher"),
@@ -50,247 +66,366 @@ def require_agent_key(x_agent_key: Optional[str], settings: Dict[str, Any]) -> N
         raise HTTPException(status_code=404, detail="not found")
 
 
-def connect(db_url: str) -> psycopg.Connection:
+def open_pool(db_url: str) -> ConnectionPool:
     if not db_url:
         raise RuntimeError("DATABASE_URL is required")
-    return psycopg.connect(db_url)
-
-
-def log_agent(conn: psycopg.Connection, *, agent_name: str, request_id: str, action: str, status: str,
-              detail: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> None:
+    # Idle connections can be dropped server-side (Cloud SQL proxy, serverless Postgres), so each checkout
+    # is verified first and connections are retired before a typical idle timeout.
+    pool = ConnectionPool(conninfo=db_url, min_size=2, max_size=10, check=ConnectionPool.check_connection,
+                          max_idle=240, max_lifetime=1800, open=False)
+    pool.open()
+    return pool
+
+
+# Hot statements are module-level constants executed with prepare=True, so each pooled
+# connection parses and plans them once and reuses the server-side prepared statement.
+SQL_LOG_AGENT = """
+    INSERT INTO public.agent_log (ts, agent_name, request_id, action, status, detail, error)
+    SELECT now(), %s, %s, l.action, l.status, l.detail, l.error
+    FROM unnest(%s::text[], %s::text[], %s, %s::text[]) WITH ORDINALITY AS l(action, status, detail, error, n)
+    ORDER BY l.n
+"""
+
+# Row lock held until the ingest commit, so concurrent polls serialize instead of re-reading the same rows
+SQL_SELECT_WATCHER_STATE = "SELECT last_seen_id FROM public.watcher_state WHERE watcher_name=%s FOR UPDATE"
+
+SQL_INSERT_WATCHER_STATE = """
+    INSERT INTO public.watcher_state (watcher_name, last_seen_id) VALUES (%s, 0)
+    ON CONFLICT DO NOTHING
+"""
+
+# Writes the RUN_START log row and advances the watcher state in a single round trip
+SQL_ADVANCE_WATCHER_STATE = """
+    WITH run_start AS (
+        INSERT INTO public.agent_log (ts, agent_name, request_id, action, status, detail, error)
+        VALUES (now(), %s, %s, 'RUN_START', 'OK', %s, NULL)
+    )
+    UPDATE public.watcher_state
+    SET last_seen_id=%s, last_run_at=now(), last_result=%s || jsonb_build_object('ts', now())
+    WHERE watcher_name=%s
+"""
+
+SQL_FETCH_NEW_CONTACTS = """
+    SELECT *
+    FROM public.contact_messages
+    WHERE id > %s
+    ORDER BY id ASC
+    LIMIT %s
+"""
+
+# Used when emit_full_row is off: only id is read, which the PK index can answer on its own
+SQL_FETCH_NEW_CONTACT_IDS = """
+    SELECT id
+    FROM public.contact_messages
+    WHERE id > %s
+    ORDER BY id ASC
+    LIMIT %s
+"""
+
+SQL_OUTBOX_INSERT_MANY = """
+    INSERT INTO public.event_outbox
+        (event_id, event_type, tenant, contact_message_id, payload, status, created_at)
+    SELECT e.event_id, e.event_type, e.tenant, e.contact_message_id, e.payload, 'NEW', now()
+    FROM unnest(%s::text[], %s::text[], %s::text[], %s::bigint[], %s)
+        AS e(event_id, event_type, tenant, contact_message_id, payload)
+    ON CONFLICT (event_id) DO NOTHING
+    RETURNING event_id
+"""
+
+SQL_OUTBOX_MARK_DISPATCHED = """
+    UPDATE public.event_outbox
+    SET status='DISPATCHED', dispatched_at=now(), last_error=NULL
+    WHERE event_id = ANY(%s)
+"""
+
+SQL_OUTBOX_MARK_ERROR = """
+    UPDATE public.event_outbox AS o
+    SET status='ERROR', last_error=f.err
+    FROM unnest(%s::text[], %s::text[]) AS f(event_id, err)
+    WHERE o.event_id = f.event_id
+"""
+
+
+LogEntry = Tuple[str, str, Optional[Dict[str, Any]], Optional[str]]
+
+
+def log_agent(conn: psycopg.Connection, *, agent_name: str, request_id: str, entries: List[LogEntry]) -> None:
+    """Flush buffered (action, status, detail, error) log rows in one INSERT, in order."""
+    if not entries:
+        return
     with conn.cursor() as cur:
         cur.execute(
-            """
-            INSERT INTO public.agent_log (ts, agent_name, request_id, action, status, detail, error)
-            VALUES (now(), %s, %s, %s, %s, %s::jsonb, %s)
-            """,
-            (agent_name, request_id, action, status, json.dumps(detail or {}), error),
+            SQL_LOG_AGENT,
+            (
+                agent_name,
+                request_id,
+                [action for action, _, _, _ in entries],
+                [status for _, status, _, _ in entries],
+                [Jsonb(detail or {}) for _, _, detail, _ in entries],
+                [error for _, _, _, error in entries],
+            ),
+            prepare=True,
         )
 
 
 def ensure_watcher_state(conn: psycopg.Connection, watcher_name: str) -> int:
     with conn.cursor() as cur:
-        cur.execute("SELECT last_seen_id FROM public.watcher_state WHERE watcher_name=%s", (watcher_name,))
+        cur.execute(SQL_SELECT_WATCHER_STATE, (watcher_name,), prepare=True)
         row = cur.fetchone()
         if row:
             return int(row[0])
-        cur.execute("INSERT INTO public.watcher_state (watcher_name, last_seen_id) VALUES (%s, 0)", (watcher_name,))
-        return 0
+        # First run: a concurrent poll may be creating the row too, so tolerate that and lock whichever row won
+        cur.execute(SQL_INSERT_WATCHER_STATE, (watcher_name,))
+        cur.execute(SQL_SELECT_WATCHER_STATE, (watcher_name,), prepare=True)
+        row = cur.fetchone()
+        return int(row[0]) if row else 0
 
 
-def update_watcher_state(conn: psycopg.Connection, watcher_name: str, last_seen_id: int, result: Dict[str, Any]) -> None:
+def advance_watcher_state(conn: psycopg.Connection, watcher_name: str, last_seen_id: int, result: Dict[str, Any], *,
+                          request_id: str, start_detail: Dict[str, Any]) -> None:
+    """Advance the watcher cursor and, in the same statement, insert this run's RUN_START agent_log row."""
     with conn.cursor() as cur:
         cur.execute(
-            """
-            UPDATE public.watcher_state
-            SET last_seen_id=%s, last_run_at=now(), last_result=%s::jsonb
-            WHERE watcher_name=%s
-            """,
-            (last_seen_id, json.dumps(result), watcher_name),
+            SQL_ADVANCE_WATCHER_STATE,
+            (watcher_name, request_id, Jsonb(start_detail),
+             last_seen_id, Jsonb(result), watcher_name),
+            prepare=True,
         )
 
 
-def fetch_new_contacts(conn: psycopg.Connection, last_seen_id: int, limit: int) -> List[Dict[str, Any]]:
+def fetch_new_contacts(conn: psycopg.Connection, last_seen_id: int, limit: int,
+                       full_row: bool) -> List[Dict[str, Any]]:
+    sql = SQL_FETCH_NEW_CONTACTS if full_row else SQL_FETCH_NEW_CONTACT_IDS
     with conn.cursor(row_factory=psycopg.rows.dict_row) as cur:
-        cur.execute(
-            """
-            SELECT *
-            FROM public.contact_messages
-            WHERE id > %s
-            ORDER BY id ASC
-            LIMIT %s
-            """,
-            (last_seen_id, limit),
-        )
-        return list(cur.fetchall())
+        cur.execute(sql, (last_seen_id, limit), prepare=True)
+        # dict_row already yields a fresh list of dicts; hand it through without copying
+        return cur.fetchall()
 
 
-def outbox_insert(conn: psycopg.Connection, event: Dict[str, Any]) -> bool:
+def outbox_insert_many(conn: psycopg.Connection, events: List[Dict[str, Any]]) -> Set[str]:
+    """Insert events in one round trip; returns the event_ids that were actually new."""
+    if not events:
+        return set()
     with conn.cursor() as cur:
-        try:
-            cur.execute(
-                """
-                INSERT INTO public.event_outbox
-                    (event_id, event_type, tenant, contact_message_id, payload, status, created_at)
-                VALUES (%s, %s, %s, %s, %s::jsonb, 'NEW', now())
-                """,
-                (
-                    event["event_id"],
-                    event["event_type"],
-                    event["tenant"],
-                    event["contact_message_id"],
-                    json.dumps(event),
-                ),
-            )
-            return True
-        except psycopg.errors.UniqueViolation:
-            return False
+        cur.execute(
+            SQL_OUTBOX_INSERT_MANY,
+            (
+                [ev["event_id"] for ev in events],
+                [ev["event_type"] for ev in events],
+                [ev["tenant"] for ev in events],
+                [ev["contact_message_id"] for ev in events],
+                [Jsonb(ev) for ev in events],
+            ),
+            prepare=True,
+        )
+        return {row[0] for row in cur.fetchall()}
 
 
 def outbox_mark_dispatched(conn: psycopg.Connection, event_ids: List[str]) -> None:
     if not event_ids:
         return
     with conn.cursor() as cur:
-        cur.execute(
-            """
-            UPDATE public.event_outbox
-            SET status='DISPATCHED', dispatched_at=now(), last_error=NULL
-            WHERE event_id = ANY(%s)
-            """,
-            (event_ids,),
-        )
+        cur.execute(SQL_OUTBOX_MARK_DISPATCHED, (event_ids,), prepare=True)
 
 
-def outbox_mark_error(conn: psycopg.Connection, event_ids: List[str], err: str) -> None:
-    if not event_ids:
+def outbox_mark_error(conn: psycopg.Connection, failed: Dict[str, List[str]]) -> None:
+    if not failed:
         return
     with conn.cursor() as cur:
         cur.execute(
-            """
-            UPDATE public.event_outbox
-            SET status='ERROR', last_error=%s
-            WHERE event_id = ANY(%s)
-            """,
-            (err[:4000], event_ids),
+            SQL_OUTBOX_MARK_ERROR,
+            (list(failed), ["; ".join(errs)[:4000] for errs in failed.values()]),
+            prepare=True,
         )
 
 
-def build_event(contact_row: Dict[str, Any], tenant_label: str, emit_full_row: bool) -> Dict[str, Any]:
+def event_template(tenant_label: str, observed_at: str) -> Tuple[Dict[str, Any], str]:
+    """Per-poll constant part of every event, plus the event_id prefix."""
+    base = {"event_type": EVENT_TYPE, "tenant": tenant_label, "observed_at": observed_at}
+    return base, f"{EVENT_TYPE}:{tenant_label}:"
+
+
+def build_event(contact_row: Dict[str, Any], base: Dict[str, Any], id_prefix: str,
+                emit_full_row: bool) -> Dict[str, Any]:
     contact_id = int(contact_row["id"])
-    event_type = "contact.created"
-    event_id = f"{event_type}:{tenant_label}:{contact_id}"
-    ev: Dict[str, Any] = {
-        "event_id": event_id,
-        "event_type": event_type,
-        "tenant": tenant_label,
-        "contact_message_id": contact_id,
-        "observed_at": utcnow().isoformat(),
-    }
+    ev: Dict[str, Any] = {**base, "event_id": id_prefix + str(contact_id), "contact_message_id": contact_id}
     if emit_full_row:
         ev["data"] = contact_row
     return ev
 
 
-async def dispatch(events: List[Dict[str, Any]], settings: Dict[str, Any]) -> Tuple[int, List[str]]:
-    urls = settings.get("DOWNSTREAM_URLS") or []
+async def dispatch(client: httpx.AsyncClient, events: List[Dict[str, Any]],
+                   settings: Dict[str, Any]) -> Tuple[int, List[str], Dict[str, List[str]]]:
+    """POST every event to every downstream URL; failures are also returned keyed by event_id."""
+    urls = settings.get("DOWNSTREAM_URLS") or ()
     if not urls:
-        return 0, []
+        return 0, [], {}
 
     hdr_name = settings.get("DOWNSTREAM_AUTH_HEADER") or "x-agent-key"
     hdr_val = settings.get("DOWNSTREAM_AUTH_VALUE") or ""
-    headers = {hdr_name: hdr_val} if hdr_val else {}
+    headers = {"content-type": "application/json"}
+    if hdr_val:
+        headers[hdr_name] = hdr_val
+
+    sem = asyncio.Semaphore(min(DISPATCH_CONCURRENCY, len(events) * len(urls)) or 1)
+
+    async def _one(body: bytes, url: str) -> httpx.Response:
+        async with sem:
+            return await client.post(url, content=body, headers=headers)
+
+    # Encode once per event with orjson, matching the stored outbox payload byte for byte
+    bodies = [orjson.dumps(ev) for ev in events]
+
+    pairs = [(ev, url) for ev in events for url in urls]
+    results = await asyncio.gather(*(_one(body, url) for body in bodies for url in urls), return_exceptions=True)
 
     dispatched = 0
     errors: List[str] = []
-    async with httpx.AsyncClient(timeout=20) as client:
-        for ev in events:
-            for url in urls:
-                try:
-                    r = await client.post(url, json=ev, headers=headers)
-                    if 200 <= r.status_code < 300:
-                        dispatched += 1
-                    else:
-                        errors.append(f"{url} status={r.status_code} body={r.text[:200]}")
-                except Exception as e:
-                    errors.append(f"{url} error={type(e).__name__}:{e}")
-    return dispatched, errors
+    failed: Dict[str, List[str]] = {}
+    for (ev, url), r in zip(pairs, results):
+        if isinstance(r, BaseException):
+            err = f"{url} error={type(r).__name__}:{r}"
+        elif 200 <= r.status_code < 300:
+            dispatched += 1
+            continue
+        else:
+            err = f"{url} status={r.status_code} body={r.text[:200]}"
+        errors.append(err)
+        failed.setdefault(ev["event_id"], []).append(err)
+    return dispatched, errors, failed
+
+
+def ingest(pool: ConnectionPool, *, watcher_name: str, tenant_label: str, request_id: str, batch_size: int,
+           emit_full_row: bool, observed_at: str) -> Dict[str, Any]:
+    """Blocking DB phase: read new contacts, write the outbox and advance the watcher state."""
+    with pool.connection() as conn:
+        last_seen = ensure_watcher_state(conn, watcher_name)
+        rows = fetch_new_contacts(conn, last_seen_id=last_seen, limit=batch_size, full_row=emit_full_row)
+
+        base, id_prefix = event_template(tenant_label, observed_at)
+        events = [build_event(r, base, id_prefix, emit_full_row=emit_full_row) for r in rows]
+
+        inserted = outbox_insert_many(conn, events)
+        to_send = [ev for ev in events if ev["event_id"] in inserted]
+
+        last_seen_after = max(last_seen, int(rows[-1]["id"])) if rows else last_seen
+
+        # Persist state + outbox first
+        run = {
+            "observed_count": len(rows),
+            "new_events_count": len(to_send),
+            "skipped_existing_events_count": len(events) - len(to_send),
+        }
+        start_detail = {"last_seen_id": last_seen, "batch_size": batch_size, "emit_full_row": emit_full_row}
+        advance_watcher_state(conn, watcher_name, last_seen_after, run,
+                              request_id=request_id, start_detail=start_detail)
+        conn.commit()
+
+    run.update(last_seen_id_before=last_seen, last_seen_id_after=last_seen_after, to_send=to_send)
+    return run
+
+
+def finish_run(pool: ConnectionPool, run: Dict[str, Any], *, watcher_name: str, request_id: str,
+               dispatched_count: int, errors: List[str], failed: Dict[str, List[str]], duration_ms: int) -> None:
+    """Blocking DB phase: record dispatch outcomes and the RUN_END log in one commit."""
+    inserted_ids = [ev["event_id"] for ev in run["to_send"]]
+    error = "; ".join(errors)[:4000] if errors else None
+    log_entries: List[LogEntry] = []
+    with pool.connection() as conn:
+        if inserted_ids:
+            outbox_mark_dispatched(conn, [ev_id for ev_id in inserted_ids if ev_id not in failed])
+            outbox_mark_error(conn, failed)
+            if errors:
+                log_entries.append(("DISPATCH", "ERROR",
+                                    {"dispatched_count": dispatched_count, "errors": errors[:10]}, error))
+            else:
+                log_entries.append(("DISPATCH", "OK", {"dispatched_count": dispatched_count}, None))
+
+        end_result = {
+            "observed_count": run["observed_count"],
+            "new_events_count": run["new_events_count"],
+            "dispatched_count": dispatched_count,
+            "skipped_existing_events_count": run["skipped_existing_events_count"],
+            "last_seen_id_before": run["last_seen_id_before"],
+            "last_seen_id_after": run["last_seen_id_after"],
+            "duration_ms": duration_ms,
+            "errors": errors[:10],
+        }
+        log_entries.append(("RUN_END", "OK" if not errors else "ERROR", end_result, error))
+        log_agent(conn, agent_name=watcher_name, request_id=request_id, entries=log_entries)
+        conn.commit()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Without DATABASE_URL the app still starts (so /health is served) and /poll reports the error
+    db_url = get_settings()["DATABASE_URL"]
+    app.state.db = open_pool(db_url) if db_url else None
+    limits = httpx.Limits(max_keepalive_connections=64, max_connections=64)
+    app.state.http = httpx.AsyncClient(timeout=20, http2=True, limits=limits)
+    try:
+        yield
+    finally:
+        if app.state.db is not None:
+            app.state.db.close()
+        await app.state.http.aclose()
 
 
-app = FastAPI(title="HOAMX Watcher Agent", version="1.0.0")
+app = FastAPI(title="HOAMX Watcher Agent", version="1.0.0", lifespan=lifespan,
+              default_response_class=ORJSONResponse)
 
+# Health checks hit this continuously; the response is immutable, so build it once and reuse it
+_HEALTH_RESPONSE = ORJSONResponse({"status": "ok"}, headers={"cache-control": "public, max-age=1"})
 
-@app.post("/poll", response_model=PollResponse)
+
+@app.get("/health")
+async def health():
+    return _HEALTH_RESPONSE
+
+
+# response_model is deliberately not set: the response is built entirely from server-side
+# values, so FastAPI's output validation is skipped. The schema is still documented via responses.
+@app.post("/poll", responses={200: {"model": PollResponse}})
 async def poll(req: PollRequest, request: Request, x_agent_key: Optional[str] = Header(default=None)):
     settings = get_settings()
     require_agent_key(x_agent_key, settings)
 
-    request_id = request.headers.get("x-request-id") or str(uuid.uuid4())
+    request_id = request.headers.get("x-request-id") or token_hex(16)
     watcher_name = settings["WATCHER_NAME"]
     tenant_label = settings["TENANT_LABEL"]
     batch_size = int(req.batch_size or settings["BATCH_SIZE"])
 
+    # One observation moment per poll, shared by every event
     started = utcnow()
+    observed_at = started.isoformat()
+    pool: Optional[ConnectionPool] = request.app.state.db
 
     try:
-        with connect(settings["DATABASE_URL"]) as conn:
-            conn.autocommit = False
-
-            last_seen = ensure_watcher_state(conn, watcher_name)
-            log_agent(conn, agent_name=watcher_name, request_id=request_id, action="RUN_START", status="OK",
-                      detail={"last_seen_id": last_seen, "batch_size": batch_size, "emit_full_row": req.emit_full_row})
-
-            rows = fetch_new_contacts(conn, last_seen_id=last_seen, limit=batch_size)
-            observed_count = len(rows)
-
-            events = [build_event(r, tenant_label=tenant_label, emit_full_row=req.emit_full_row) for r in rows]
-
-            new_events = 0
-            skipped = 0
-            inserted_ids: List[str] = []
-
-            for ev in events:
-                if outbox_insert(conn, ev):
-                    new_events += 1
-                    inserted_ids.append(ev["event_id"])
-                else:
-                    skipped += 1
-
-            last_seen_after = last_seen if not rows else int(rows[-1]["id"])
-
-            # Persist state + outbox first
-            state_result = {
-                "observed_count": observed_count,
-                "new_events_count": new_events,
-                "skipped_existing_events_count": skipped,
-                "ts": utcnow().isoformat(),
-            }
-            update_watcher_state(conn, watcher_name, max(last_seen, last_seen_after), state_result)
-            conn.commit()
+        if pool is None:
+            raise RuntimeError("DATABASE_URL is required")
+        # psycopg calls block, so the DB phases run in the threadpool and only dispatch stays on the loop
+        run = await run_in_threadpool(ingest, pool, watcher_name=watcher_name, tenant_label=tenant_label,
+                                      request_id=request_id, batch_size=batch_size,
+                                      emit_full_row=req.emit_full_row, observed_at=observed_at)
 
         dispatched_count = 0
         errors: List[str] = []
+        failed: Dict[str, List[str]] = {}
 
-        if inserted_ids:
-            to_send = [ev for ev in events if ev["event_id"] in set(inserted_ids)]
-            dispatched_count, errors = await dispatch(to_send, settings)
-
-            with connect(settings["DATABASE_URL"]) as conn2:
-                conn2.autocommit = False
-                if errors:
-                    outbox_mark_error(conn2, inserted_ids, "; ".join(errors)[:2000])
-                    log_agent(conn2, agent_name=watcher_name, request_id=request_id, action="DISPATCH", status="ERROR",
-                              detail={"dispatched_count": dispatched_count, "errors": errors[:10]},
-                              error="; ".join(errors)[:4000])
-                else:
-                    outbox_mark_dispatched(conn2, inserted_ids)
-                    log_agent(conn2, agent_name=watcher_name, request_id=request_id, action="DISPATCH", status="OK",
-                              detail={"dispatched_count": dispatched_count})
-                conn2.commit()
-
-        with connect(settings["DATABASE_URL"]) as conn3:
-            conn3.autocommit = False
-            end_result = {
-                "observed_count": observed_count,
-                "new_events_count": new_events,
-                "dispatched_count": dispatched_count,
-                "skipped_existing_events_count": skipped,
-                "last_seen_id_before": last_seen,
-                "last_seen_id_after": max(last_seen, last_seen_after),
-                "duration_ms": int((utcnow() - started).total_seconds() * 1000),
-                "errors": errors[:10],
-            }
-            log_agent(conn3, agent_name=watcher_name, request_id=request_id, action="RUN_END",
-                      status="OK" if not errors else "ERROR", detail=end_result,
-                      error=None if not errors else "; ".join(errors)[:4000])
-            conn3.commit()
-
-        return PollResponse(
-            observed_count=observed_count,
-            new_events_count=new_events,
+        if run["to_send"]:
+            dispatched_count, errors, failed = await dispatch(request.app.state.http, run["to_send"], settings)
+
+        await run_in_threadpool(finish_run, pool, run, watcher_name=watcher_name, request_id=request_id,
+                                dispatched_count=dispatched_count, errors=errors, failed=failed,
+                                duration_ms=int((utcnow() - started).total_seconds() * 1000))
+
+        return PollResponse.model_construct(
+            observed_count=run["observed_count"],
+            new_events_count=run["new_events_count"],
             dispatched_count=dispatched_count,
-            skipped_existing_events_count=skipped,
-            last_seen_id_before=last_seen,
-            last_seen_id_after=max(last_seen, last_seen_after),
+            skipped_existing_events_count=run["skipped_existing_events_count"],
+            last_seen_id_before=run["last_seen_id_before"],
+            last_seen_id_after=run["last_seen_id_after"],
             errors=errors,
         )
 